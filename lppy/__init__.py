@@ -12,7 +12,36 @@ __all__ = [
     "Layout",
 ]
 
-from lppy.midi import Message
-from lppy.models import Launchpad, LaunchpadPro, LaunchpadMiniMk3
-from lppy.enums import RGB, Color, Scroll
-from lppy.layout import Result, Button, ButtonState, Layout
+import importlib
+
+# Public names are imported on first access, so importing a single submodule
+# (e.g. ``lppy.enums``) doesn't load the MIDI backend.
+_LAZY = {
+    "Message": "lppy.message",
+    "Launchpad": "lppy.models",
+    "LaunchpadPro": "lppy.models",
+    "LaunchpadMiniMk3": "lppy.models",
+    "RGB": "lppy.enums",
+    "Color": "lppy.enums",
+    "Scroll": "lppy.enums",
+    "Result": "lppy.layout",
+    "Button": "lppy.layout",
+    "ButtonState": "lppy.enums",
+    "Layout": "lppy.layout",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,11 +1,85 @@
 import time
-from typing import Optional, Tuple
+import threading
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from lppy.chartab import CHAR_BITS
 from lppy.enums import Color, RGB, Scroll
 from lppy.midi import Midi, InputDevice, OutputDevice
 
 
+@lru_cache(maxsize=128)
+def scroll_frames(
+    length: int, scroll: Scroll
+) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """Compute the frames for scrolling a string of the given length.
+
+    Every frame is a tuple of ``(character index, offset)`` pairs that should
+    be written with ``write_char``. Two characters are visible at a time.
+
+    Args:
+        length (int): Length of the (already padded) string.
+        scroll (Scroll): Scroll direction, either left or right.
+
+    Returns:
+        tuple: Frames in the order they should be shown.
+    """
+    # Character indices are never negative here, so only the upper bound has
+    # to be clamped.
+    last = length - 1
+    width = length * 8
+    if scroll == Scroll.left:
+        steps = range(width + 8)
+    else:
+        steps = range(width + 1, 0, -1)
+
+    frames = []
+    for n in steps:
+        frame = []
+        if n <= width:
+            frame.append((min((n // 16) * 2, last), 8 - n % 16))
+        if n > 7:
+            frame.append(
+                (min(((n - 8) // 16) * 2 + 1, last), 8 - (n - 8) % 16)
+            )
+        frames.append(tuple(frame))
+    return tuple(frames)
+
+
+@lru_cache(maxsize=4096)
+def char_pixels(
+    code: int, offset: int, first: int, step: int
+) -> Tuple[Tuple[int, bool], ...]:
+    """Compute the pixels of a character drawn with a lateral offset.
+
+    Only the pixels that are still on the 8x8 grid after the offset are
+    returned.
+
+    Args:
+        code (int): Character code (0..255).
+        offset (int): Lateral offset of the character.
+        first (int): LED number of the top-left pixel.
+        step (int): Difference between LED numbers of consecutive rows.
+
+    Returns:
+        tuple: ``(LED number, lit)`` pairs, row by row.
+    """
+    start, stop = max(0, -offset), min(8, 8 - offset)
+    return tuple(
+        (n, lit)
+        for i, row in zip(
+            range(first, first + 8 * step, step), CHAR_BITS[code]
+        )
+        for n, lit in zip(
+            range(i + start + offset, i + stop + offset), row[start:stop]
+        )
+    )
+
+
 class LaunchpadBase:
+    __slots__ = ("input", "output", "_batch", "_leds", "_scroll")
+
     INPUT_NAME: Optional[Tuple[str, int]] = None
     OUTPUT_NAME: Optional[Tuple[str, int]] = None
 
@@ -16,6 +90,13 @@ class LaunchpadBase:
     def __init__(self):
         self.input: Optional[InputDevice] = None
         self.output: Optional[OutputDevice] = None
+        # LED updates collected by ``batch``, ``None`` when not batching
+        self._batch: Optional[List[Tuple[int, RGB]]] = None
+        # Last color sent to each LED, used to skip updates that wouldn't
+        # change anything on the device
+        self._leds: Dict[int, Any] = {}
+        # Thread running ``scroll_string`` and the event that stops it
+        self._scroll: Optional[Tuple[threading.Thread, threading.Event]] = None
         self.open()
 
     def __delete__(self):
@@ -24,7 +105,10 @@ class LaunchpadBase:
     def open(self):
         """Open launchpad devices."""
         # First close them if they are already open
-        self.close()
+        if self.input is not None or self.output is not None:
+            self.close()
+        # The LEDs of a freshly opened device are in an unknown state
+        self._leds.clear()
         self.input = Midi.open_device(
             name=self.INPUT_NAME, direction=Midi.Direction.input
         )
@@ -34,13 +118,61 @@ class LaunchpadBase:
 
     def close(self):
         """Close this Launchpad."""
+        # Stop dispatching input first, so no callback can start scrolling
+        # again after the scroll is cancelled.
         if self.input is not None and self.input.is_open:
             self.input.close()
             self.input = None
+        self.cancel_scroll()
         if self.output is not None and self.output.is_open:
+            self._restore()
+            # Don't lose LED updates collected by an unfinished ``batch``
+            self._send_batch()
             self.output.close()
             self.output = None
 
+    def _restore(self):
+        """Restore the device's state before the output is closed.
+
+        Called by ``close`` after the input is closed and the scrolling is
+        stopped, so nothing else is writing to the device.
+        """
+
+    @contextmanager
+    def batch(self):
+        """Collect LED updates and send them when the block exits.
+
+        On models that can light multiple LEDs with a single message, all the
+        ``led_on`` and ``led_on_many`` calls made inside the block are sent
+        as one message. Other commands send the collected updates first, so
+        the order of updates is preserved.
+
+        Example::
+
+            with launchpad.batch():
+                for n in range(11, 19):
+                    launchpad.led_on(RGB(r=255), n=n)
+        """
+        if self._batch is not None:
+            # Nested block, the outermost one sends the updates
+            yield
+            return
+
+        self._batch = []
+        try:
+            yield
+        finally:
+            leds, self._batch = self._batch, None
+            if leds:
+                self.led_on_many(leds)
+
+    def _send_batch(self):
+        """Send the LED updates collected so far by ``batch``."""
+        if self._batch:
+            leds, self._batch = self._batch, None
+            self.led_on_many(leds)
+            self._batch = []
+
     def flush_buttons(self):
         """Clear the button buffer.
 
@@ -70,20 +202,40 @@ class LaunchpadBase:
         n: Optional[int] = None,
         x: Optional[int] = None,
         y: Optional[int] = None,
+        force: bool = False,
     ):
         """Turn on the selected LED using selected color.
 
         Led can be selected either by passing in the led number ``n`` or
         by selecting the ``x`` and ``y`` position of the led.
 
+        Updates that wouldn't change the LED's color are not sent.
+
         Args:
             color (RGB): Selected RGB color.
             n (int, optional): LED's number.
             x (int, optional): x coordinate of the LED.
             y (int, optional): y coordinate of the LED.
+            force (bool): Send the update even if the LED already has the
+                selected color.
         """
         raise NotImplementedError()
 
+    def led_on_many(
+        self, leds: Iterable[Tuple[int, RGB]], force: bool = False
+    ):
+        """Turn on multiple LEDs, each with its own color.
+
+        Models that support it send all the LEDs in a single message.
+
+        Args:
+            leds (Iterable[Tuple[int, RGB]]): Pairs of LED number and color.
+            force (bool): Send the updates even for the LEDs that already
+                have the selected color.
+        """
+        for n, color in leds:
+            self.led_on(color, n=n, force=force)
+
     def write_char(self, char: str, color: RGB, offset: int = 0):
         """Write character in colors and lateral offset."""
         raise NotImplementedError()
@@ -96,61 +248,143 @@ class LaunchpadBase:
         wait_ms: int = 100,
     ):
         """Scroll string with color."""
-        if scroll == Scroll.left:
-            string += " "  # just to avoid artifacts on full width characters
-            for n in range((len(string) + 1) * 8):
-                if n <= len(string) * 8:
-                    self.write_char(
-                        string[self._limit((n // 16) * 2, 0, len(string) - 1)],
-                        color,
-                        8 - n % 16,
-                    )
-                if n > 7:
-                    self.write_char(
-                        string[
-                            self._limit(
-                                (((n - 8) // 16) * 2) + 1, 0, len(string) - 1
-                            )
-                        ],
-                        color,
-                        8 - (n - 8) % 16,
-                    )
-                time.sleep(0.001 * wait_ms)
-
-        elif scroll == Scroll.right:
-            # TODO: Just a quick hack (screen is erased before scrolling
-            #       begins). Characters at odd positions from the right
-            #       (1, 3, 5), with pixels at the left, e.g. 'C' will have
-            #       artifacts at the left (pixel repeated).
+        self._write_string(string, color, scroll, wait_ms)
 
+    def scroll_string(
+        self,
+        string: str,
+        color: RGB,
+        scroll: Scroll = Scroll.none,
+        wait_ms: int = 100,
+        done: Optional[Callable[[], Any]] = None,
+    ):
+        """Scroll string with color on a background thread.
+
+        Returns immediately. If a string is already scrolling, it's cancelled
+        first.
+
+        The LED methods aren't thread safe. While the string is scrolling,
+        other threads must not drive the LEDs (``led_on``, ``batch``,
+        ``write_char``...), or updates can be lost and the remembered LED
+        colors can get out of sync with the device. Call ``cancel_scroll``
+        first, like ``Layout`` does before handling a button.
+
+        Args:
+            string (str): String to show.
+            color (RGB): Color of the characters.
+            scroll (Scroll): Scroll direction.
+            wait_ms (int): Time between frames in milliseconds.
+            done (Callable, optional): Called from the scrolling thread after
+                the whole string is shown. Not called if the scrolling is
+                cancelled.
+        """
+        self.cancel_scroll()
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self.__scroll,
+            args=(string, color, scroll, wait_ms, stop, done),
+            daemon=True,
+        )
+        self._scroll = (thread, stop)
+        thread.start()
+
+    def cancel_scroll(self) -> bool:
+        """Stop the string started with ``scroll_string``.
+
+        Waits until the scrolling thread exits, unless called from it.
+
+        Returns:
+            bool: ``True`` if a string was still scrolling.
+        """
+        if self._scroll is None:
+            return False
+        thread, stop = self._scroll
+        self._scroll = None
+        running = thread.is_alive()
+        stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        return running
+
+    def __scroll(
+        self,
+        string: str,
+        color: RGB,
+        scroll: Scroll,
+        wait_ms: int,
+        stop: threading.Event,
+        done: Optional[Callable[[], Any]],
+    ):
+        if self._write_string(string, color, scroll, wait_ms, stop):
+            return
+        if done is not None:
+            done()
+
+    def _write_string(
+        self,
+        string: str,
+        color: RGB,
+        scroll: Scroll,
+        wait_ms: int,
+        stop: Optional[threading.Event] = None,
+    ) -> bool:
+        """Scroll string with color, until the optional stop event is set.
+
+        Returns:
+            bool: ``True`` if the scrolling was stopped before the end.
+        """
+        # Frames are scheduled against absolute deadlines so the time spent
+        # drawing them doesn't add up to drift.
+        dt = 0.001 * wait_ms
+        deadline = time.monotonic()
+        if scroll == Scroll.left or scroll == Scroll.right:
             # just to avoid artifacts on full width characters
-            string = " " + string + " "
-            # for n in range( (len(string) + 1) * 8 - 1, 0, -1 ):
-            for n in range((len(string) + 1) * 8 - 7, 0, -1):
-                if n <= len(string) * 8:
-                    self.write_char(
-                        string[self._limit((n // 16) * 2, 0, len(string) - 1)],
-                        color,
-                        8 - n % 16,
-                    )
-                if n > 7:
-                    self.write_char(
-                        string[
-                            self._limit(
-                                (((n - 8) // 16) * 2) + 1, 0, len(string) - 1
-                            )
-                        ],
-                        color,
-                        8 - (n - 8) % 16,
-                    )
-                time.sleep(0.001 * wait_ms)
+            if scroll == Scroll.left:
+                string += " "
+            else:
+                # TODO: Just a quick hack (screen is erased before scrolling
+                #       begins). Characters at odd positions from the right
+                #       (1, 3, 5), with pixels at the left, e.g. 'C' will
+                #       have artifacts at the left (pixel repeated).
+                string = " " + string + " "
+
+            for frame in scroll_frames(length=len(string), scroll=scroll):
+                # Characters sharing the frame are sent together
+                with self.batch():
+                    for index, offset in frame:
+                        self.write_char(string[index], color, offset)
+                deadline += dt
+                if self._sleep_until(deadline, stop):
+                    return True
         else:
             # TODO: not a good idea :)
             for i in string:
                 for n in range(4):
                     # pseudo repetitions to compensate the timing a bit
                     self.write_char(i, color)
-                    time.sleep(0.001 * wait_ms)
+                    deadline += dt
+                    if self._sleep_until(deadline, stop):
+                        return True
+        return False
+
+    @staticmethod
+    def _sleep_until(
+        deadline: float, stop: Optional[threading.Event] = None
+    ) -> bool:
+        """Sleep until the ``time.monotonic`` deadline, if it's not passed.
+
+        Returns:
+            bool: ``True`` if the stop event is set, the sleep is cut short
+                in that case.
+        """
+        remaining = deadline - time.monotonic()
+        if stop is None:
+            if remaining > 0:
+                time.sleep(remaining)
+            return False
+        if remaining > 0:
+            return stop.wait(remaining)
+        return stop.is_set()
 
     @staticmethod
     def _limit(n: int, minimum: int, maximum: int):
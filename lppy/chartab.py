@@ -259,3 +259,10 @@ CHAR_TAB = (
     (0x00, 0x00, 0x7C, 0x7C, 0x7C, 0x7C, 0x00, 0x00),  # Char 254 (.)
     (0x00, 0x00, 0x00, 0x00, 0x00, 0x42, 0x7E, 0x00),  # Char 255 (.)
 )
+
+# Pixels of every character, decoded once: CHAR_BITS[char][row][column] is
+# ``True`` when that pixel is lit.
+CHAR_BITS = tuple(
+    tuple(tuple(bool(code & (0x80 >> j)) for j in range(8)) for code in codes)
+    for codes in CHAR_TAB
+)
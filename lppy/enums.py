@@ -1,6 +1,13 @@
 import enum
 import string
-from dataclasses import dataclass
+from typing import NamedTuple
+from functools import lru_cache
+
+HEX_DIGITS = frozenset(string.hexdigits)
+# Value of every two character hex string, in any letter case.
+HEX_BYTES = {
+    a + b: int(a + b, 16) for a in string.hexdigits for b in string.hexdigits
+}
 
 
 class Direction(enum.Enum):
@@ -28,30 +35,37 @@ class ButtonState(str, enum.Enum):
     no_change = "no_change"
 
     def __invert__(self) -> "ButtonState":
-        if self == self.on:
+        if self is self.on:
             return self.off
-        elif self == self.off:
+        elif self is self.off:
             return self.on
         return self
 
 
-@dataclass
-class RGB:
+@lru_cache(maxsize=1024)
+def _scale(r: int, g: int, b: int, minimum: int, maximum: int) -> "RGB":
+    k = (maximum - minimum) * (1.0 / 255.0)
+    return RGB(
+        r=int(r * k + minimum), g=int(g * k + minimum), b=int(b * k + minimum),
+    )
+
+
+class RGB(NamedTuple):
     r: int = 0
     g: int = 0
     b: int = 0
 
     def scale(self, minimum, maximum) -> "RGB":
-        """Scale the color range to [minimum, maximum]."""
-        return RGB(
-            r=int(((self.r / 255.0) * (maximum - minimum)) + minimum),
-            g=int(((self.g / 255.0) * (maximum - minimum)) + minimum),
-            b=int(((self.b / 255.0) * (maximum - minimum)) + minimum),
-        )
+        """Scale the color range to [minimum, maximum].
+
+        Results are cached, since the same few colors are scaled for every
+        LED that gets written.
+        """
+        return _scale(*self, minimum, maximum)
 
     @property
     def hex(self):
-        return f"#{self.r:02x}{self.g:02x}{self.b:02x}"
+        return "#{:02x}{:02x}{:02x}".format(*self)
 
     @staticmethod
     def __check_color_string(color: str) -> str:
@@ -59,20 +73,21 @@ class RGB:
         if (
             len(color) == 7
             and color[0] == "#"
-            and all([color[i] in string.hexdigits for i in range(1, 7)])
+            and HEX_DIGITS.issuperset(color[1:])
         ):
             return color[1:]
-        elif len(color) == 6 and all(
-            [color[i] in string.hexdigits for i in range(6)]
-        ):
+        elif len(color) == 6 and HEX_DIGITS.issuperset(color):
             return color
         else:
             raise ValueError(f"Invalid color string: {color}")
 
     @classmethod
+    @lru_cache(maxsize=256)
     def parse(cls, color: str) -> "RGB":
         """Parse color string."""
         color = cls.__check_color_string(color=color)
         return cls(
-            r=int(color[:2], 16), g=int(color[2:4], 16), b=int(color[4:], 16),
+            r=HEX_BYTES[color[:2]],
+            g=HEX_BYTES[color[2:4]],
+            b=HEX_BYTES[color[4:]],
         )
@@ -4,12 +4,13 @@ import inspect
 import logging
 from pathlib import Path
 from copy import deepcopy
-from functools import partial
-from typing import Optional, Callable
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 
 from tea.utils import get_object
 
+from lppy import errors
 from lppy.midi import Message
 from lppy.enums import RGB, ButtonState, Scroll
 from lppy.models.launchpad import LaunchpadBase
@@ -17,7 +18,21 @@ from lppy.models.launchpad import LaunchpadBase
 
 logger = logging.getLogger(__name__)
 
+# MIDI data bytes, and therefore button numbers, are in the range 0..127.
+MIDI_NOTES = 128
 
+# Types of the layout json values that can be shared instead of copied
+IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+# Button attribute holding the LED color of each button state
+STATE_COLORS = {
+    ButtonState.on: "color_on",
+    ButtonState.off: "color_off",
+    ButtonState.err: "color_err",
+}
+
+
+@lru_cache(maxsize=None)
 def get_callable(path: str) -> Optional[Callable]:
     try:
         obj_path, name = path.split(":")
@@ -28,6 +43,19 @@ def get_callable(path: str) -> Optional[Callable]:
         return None
 
 
+@lru_cache(maxsize=None)
+def get_parameters(func: Callable) -> Tuple[Tuple[str, Any], ...]:
+    """Return the ``(name, annotation)`` pairs of the callable's parameters.
+
+    Inspecting signatures is slow and layouts often use the same callable for
+    many buttons, so the result is cached per callable.
+    """
+    return tuple(
+        (parameter.name, parameter.annotation)
+        for parameter in inspect.signature(func).parameters.values()
+    )
+
+
 @dataclass
 class Result:
     char: Optional[str] = None
@@ -42,27 +70,78 @@ class Callback:
         self.command = command
         self.args = args
         self.button = button
-        self.callback = get_callable(command)
+        # The command is imported and inspected on its first call, so loading
+        # a layout doesn't import the scripts of buttons that are never used.
+        self.callback: Optional[Callable] = None
+        self.parameters: Dict[str, Any] = {}
+        self.message_parameters: Tuple[str, ...] = ()
+        self.button_parameters: Tuple[str, ...] = ()
+        self.__invoke = self.__resolve
+        # The traceback is logged only for the first failure, a button that
+        # keeps failing would otherwise flood the log on every press.
+        self.__failed = False
+
+    def __resolve(self, message: Message) -> Result:
+        """Resolve the command, then run it like all the following calls."""
+        self.callback = get_callable(self.command)
+        if self.callback is None:
+            # Import error is already logged by get_callable
+            return Result()
         # Inspect callback parameters
-        self.parameters = {}
-        sig = inspect.signature(self.callback)
-        for parameter in sig.parameters.values():
-            self.parameters[parameter.name] = parameter.annotation
+        self.parameters = dict(get_parameters(self.callback))
+        # Resolve which parameters receive the message and the button once,
+        # instead of checking annotations on every call.
+        self.message_parameters = tuple(
+            name for name, dtype in self.parameters.items() if dtype is Message
+        )
+        self.button_parameters = tuple(
+            name for name, dtype in self.parameters.items() if dtype is Button
+        )
+        self.__invoke = self.__bind()
+        return self.__invoke(message)
+
+    def __bind(self) -> Callable[[Message], Result]:
+        """Build the function that runs the callback for a message.
+
+        Everything that doesn't depend on the message is resolved here, once.
+        """
+        callback = self.callback
+        if not all(isinstance(v, IMMUTABLE_TYPES) for v in self.args.values()):
+            # Mutable arguments are deep copied for every call, so the
+            # callback can't change them
+            return lambda message: callback(**self.__create_kwargs(message))
+
+        # Immutable arguments can be shared, unpacking them already builds a
+        # new kwargs dict for every call
+        kwargs = dict(self.args)
+        for name in self.message_parameters:
+            kwargs.pop(name, None)
+        for name in self.button_parameters:
+            kwargs[name] = self.button
+        names = self.message_parameters
+        if not names:
+            return lambda message: callback(**kwargs)
+        return lambda message: callback(
+            **kwargs, **dict.fromkeys(names, message)
+        )
 
     def __create_kwargs(self, message: Message) -> dict:
         kwargs = deepcopy(self.args)
-        for name, dtype in self.parameters.items():
-            if dtype == Message:
-                kwargs[name] = message
-            elif dtype == Button:
-                kwargs[name] = self.button
+        for name in self.message_parameters:
+            kwargs[name] = message
+        for name in self.button_parameters:
+            kwargs[name] = self.button
         return kwargs
 
     def __call__(self, message: Message) -> Result:
         try:
-            return self.callback(**self.__create_kwargs(message=message))
+            return self.__invoke(message)
         except Exception as e:
-            logger.exception("Error running callback: %s", e)
+            if self.__failed:
+                logger.error("Error running callback: %s", e)
+            else:
+                self.__failed = True
+                logger.exception("Error running callback: %s", e)
             return Result()
 
 
@@ -71,7 +150,7 @@ class Button:
 
     def __init__(
         self,
-        led_on: partial,
+        led_on: Callable[[RGB, int], Any],
         action: Message.Action,
         n: int,
         color_on: RGB,
@@ -86,7 +165,8 @@ class Button:
         """Create a button.
 
         Args:
-            led_on: Function for turning the led on.
+            led_on: Function for turning the led on, called with the color
+                and the button number, e.g. ``Launchpad.led_on``.
             action: Type of action that this button should respond to.
             n: Button number.
             color_on: Button on color.
@@ -113,10 +193,9 @@ class Button:
         self.state_func_args = state_func_args or {}
         # Add button to state func args if needed
         if self.state_func is not None:
-            sig = inspect.signature(self.state_func)
-            for parameter in sig.parameters.values():
-                if parameter.annotation == Button:
-                    self.state_func_args[parameter.name] = self
+            for name, annotation in get_parameters(self.state_func):
+                if annotation is Button:
+                    self.state_func_args[name] = self
                     break
         self.state = (
             initial_state
@@ -128,7 +207,7 @@ class Button:
         )
 
     @classmethod
-    def from_dict(cls, led_on: partial, d: dict) -> "Button":
+    def from_dict(cls, led_on: Callable[[RGB, int], Any], d: dict) -> "Button":
         return cls(
             led_on=led_on,
             action=Message.Action(d.get("action", Message.Action.click)),
@@ -154,15 +233,12 @@ class Button:
         return self.state == ButtonState.off
 
     def led_on(self):
-        if self.state == ButtonState.on:
-            self._led_on(self.color_on)
-        elif self.state == ButtonState.off:
-            self._led_on(self.color_off)
-        elif self.state == ButtonState.err:
-            self._led_on(self.color_off)
+        color = STATE_COLORS.get(self.state)
+        if color is not None:
+            self._led_on(getattr(self, color), self.n)
 
     def led_off(self):
-        self._led_on(RGB())
+        self._led_on(RGB(), self.n)
 
     def set_state(self, state: ButtonState):
         self.state = state
@@ -192,12 +268,25 @@ class Layout:
 
         # Load layout
         self.layout = {}
+        # Buttons indexed by the action they respond to and their number, so
+        # a message is dispatched with a single lookup. Numbers outside of
+        # the MIDI range (e.g. the classic Launchpad's top row) are kept in
+        # a dict instead.
+        self.registry: Dict[Message.Action, List[Optional[Button]]] = {
+            action: [None] * MIDI_NOTES for action in Message.Action
+        }
+        self.other_registry: Dict[Tuple[Message.Action, int], Button] = {}
         for button_data in data["layout"]:
-            n = button_data["n"]
             button = Button.from_dict(
-                led_on=partial(self.launchpad.led_on, n=n), d=button_data,
+                led_on=self.launchpad.led_on, d=button_data
             )
+            if button.n < 0:
+                raise errors.LEDSelectionError(n=button.n, x=None, y=None)
             self.layout[button.n] = button
+            if button.n < MIDI_NOTES:
+                self.registry[button.action][button.n] = button
+            else:
+                self.other_registry[button.action, button.n] = button
 
         self.reset()
 
@@ -212,14 +301,33 @@ class Layout:
             # Reset all leds
             self.launchpad.led_all_off()
 
-        # Put all buttons in the off state
-        for button in self.layout.values():
-            button.led_on()
+        # Put all buttons in the off state, sent together on models that can
+        # set multiple LEDs with a single message
+        with self.launchpad.batch():
+            for button in self.layout.values():
+                button.led_on()
+
+    def get_button(self, action: Message.Action, n: int) -> Optional[Button]:
+        """Get the button responding to the action on the button number.
+
+        Args:
+            action (Message.Action): Action of the message.
+            n (int): Button number.
+
+        Returns:
+            Optional[Button]: The button or ``None`` if there is none.
+        """
+        if 0 <= n < MIDI_NOTES:
+            return self.registry[action][n]
+        return self.other_registry.get((action, n))
 
     def callback(self, message: Message):
         try:
-            button = self.layout.get(message.n, None)
-            if button is not None and button.action == message.action:
+            button = self.get_button(message.action, message.n)
+            if button is not None:
+                # Pressing a button stops the text that's still scrolling
+                if self.launchpad.cancel_scroll():
+                    self.reset()
                 result = button.execute(message=message)
                 if result is None:
                     return
@@ -230,13 +338,15 @@ class Layout:
                     )
                     self.reset(other_led_off=False)
                 elif result.text:
-                    self.launchpad.write_string(
+                    # Scrolled on a background thread, so the buttons keep
+                    # responding in the meantime
+                    self.launchpad.scroll_string(
                         string=result.text,
                         color=result.color,
                         scroll=result.scroll,
                         wait_ms=result.wait_ms,
+                        done=self.reset,
                     )
-                    self.reset()
                 else:
                     self.reset()
 
@@ -1,5 +1,5 @@
 import enum
-from dataclasses import dataclass
+from typing import NamedTuple
 
 
 class Action(enum.Enum):
@@ -8,8 +8,7 @@ class Action(enum.Enum):
     click = "click"
 
 
-@dataclass
-class Message:
+class Message(NamedTuple):
     Action = Action
 
     action: Action
@@ -20,6 +19,6 @@ class Message:
 
     @property
     def duration(self):
-        if self.action == self.Action.click:
+        if self.action is Action.click:
             return self.diff
         return 0
@@ -1,8 +1,10 @@
+import time
 import queue
+import atexit
 import logging
 import threading
-from collections import defaultdict
-from typing import Union, Optional, Tuple, Callable
+from collections import deque
+from typing import Dict, Union, Optional, Tuple, Callable
 
 import rtmidi
 
@@ -12,6 +14,15 @@ from lppy.message import Message, Action
 
 logger = logging.getLogger(__name__)
 
+# Status nibbles of the polyphonic and channel pressure (aftertouch)
+# messages, which stream while a pad is held and aren't button events.
+PRESSURE_STATUSES = frozenset((0xA0, 0xD0))
+
+# Port names are reused for this many seconds before the devices are
+# enumerated again, because creating a MIDI client just to list the ports is
+# slow on some backends (e.g. ALSA).
+PORTS_TTL = 1.0
+
 
 class Device:
     def __init__(self, midi: Union[rtmidi.MidiIn, rtmidi.MidiOut]):
@@ -28,104 +39,236 @@ class Device:
 
 
 class InputDevice(Device):
-    def __init__(self, midi: rtmidi.MidiIn):
+    def __init__(self, midi: rtmidi.MidiIn, buffer_size: int = 512):
+        """Wrap an open MIDI input.
+
+        Args:
+            midi (rtmidi.MidiIn): Open MIDI input.
+            buffer_size (int): Maximum number of messages kept for ``read``.
+                When nobody reads them (e.g. only callbacks are used), the
+                oldest messages are dropped.
+        """
         super().__init__(midi=midi)
-        self.__message_queue = queue.Queue()
+        # Only polled with ``read``, so it doesn't need a blocking queue
+        self.__message_queue = deque(maxlen=buffer_size)
         self.__callback_queue = queue.Queue()
-        self.__callbacks = defaultdict(list)
+        # Replaced, never modified in place, so the dispatch thread can
+        # iterate them while callbacks are added or removed
+        self.__callbacks: Dict[
+            Action, Tuple[Callable[[Message], None], ...]
+        ] = {}
         self.midi.set_callback(self.__callback)
-        self.__stop_event = threading.Event()
         self.__thread = threading.Thread(
             target=self.__handle_callbacks, daemon=True
         )
         self.__thread.start()
 
     def __callback(self, message, data=None):
-        ((code, n, intensity), diff) = message
+        # Called on the RtMidi thread: only hand the raw event over to the
+        # dispatch thread so MIDI input is never held up.
+        if (message[0][0] & 0xF0) in PRESSURE_STATUSES:
+            return
+        self.__callback_queue.put_nowait(message)
+
+    @staticmethod
+    def __create_messages(event) -> Tuple[Message, ...]:
+        ((code, n, intensity), diff) = event
         if intensity == 0:
             # Intensity == 0 generates two messages release and click
-            msg1 = Message(
-                Action.release, code=code, n=n, intensity=intensity, diff=diff,
+            return (
+                Message(Action.release, code, n, intensity, diff),
+                Message(Action.click, code, n, intensity, diff),
             )
-            msg2 = Message(
-                Action.click, code=code, n=n, intensity=intensity, diff=diff,
-            )
-            self.__message_queue.put_nowait(msg1)
-            self.__message_queue.put_nowait(msg2)
-            self.__callback_queue.put_nowait(msg1)
-            self.__callback_queue.put_nowait(msg2)
-        else:
-            msg = Message(
-                Action.press, code=code, n=n, intensity=intensity, diff=diff,
-            )
-            self.__message_queue.put_nowait(msg)
-            self.__callback_queue.put_nowait(msg)
+        return (Message(Action.press, code, n, intensity, diff),)
 
     def __handle_callbacks(self):
-        while not self.__stop_event.is_set():
+        while True:
+            event = self.__callback_queue.get()
+            if event is None:
+                return
             try:
-                message = self.__callback_queue.get()
-                for callback in self.__callbacks.get(message.action, []):
-                    callback(message)
+                messages = self.__create_messages(event)
+                self.__message_queue.extend(messages)
+                for message in messages:
+                    for callback in self.__callbacks.get(message.action, ()):
+                        callback(message)
             except Exception:
                 # FIXME: What can be raised?
                 pass
 
     def close(self):
-        self.__stop_event.set()
+        # Wake up the dispatch thread so it exits, unless a callback is
+        # closing the device from it
+        self.__callback_queue.put_nowait(None)
+        if threading.current_thread() is not self.__thread:
+            self.__thread.join()
         super().close()
 
     def read(self):
         """Get a single message."""
         try:
-            return self.__message_queue.get_nowait()
-        except queue.Empty:
+            return self.__message_queue.popleft()
+        except IndexError:
             return None
 
     def flush(self):
         """Remove all messages from the queue."""
-        with self.__message_queue.mutex:
-            self.__message_queue.queue.clear()
+        self.__message_queue.clear()
         with self.__callback_queue.mutex:
             self.__callback_queue.queue.clear()
 
     def set_callback(
         self, action: Action, callback: Callable[[Message], None]
     ):
-        if callback not in self.__callbacks[action]:
-            self.__callbacks[action].append(callback)
+        callbacks = self.__callbacks.get(action, ())
+        if callback not in callbacks:
+            self.__callbacks[action] = callbacks + (callback,)
 
     def remove_callback(
         self, action: Action, callback: Callable[[Message], None]
     ):
-        if callback in self.__callbacks[action]:
-            self.__callbacks[action].remove(callback)
+        callbacks = self.__callbacks.get(action, ())
+        if callback in callbacks:
+            self.__callbacks[action] = tuple(
+                c for c in callbacks if c != callback
+            )
 
 
 class OutputDevice(Device):
     def __init__(self, midi: rtmidi.MidiOut):
         super().__init__(midi=midi)
+        # Messages are written to the device on a separate thread so callers
+        # never wait on the MIDI driver.
+        self.__message_queue = queue.Queue()
+        # First error raised while sending, re-raised to the caller
+        self.__error: Optional[Exception] = None
+        self.__thread = threading.Thread(
+            target=self.__write_messages, daemon=True
+        )
+        self.__thread.start()
+        # The writer is a daemon thread, so send whatever is still queued
+        # if the device isn't closed before the interpreter exits.
+        atexit.register(self.close)
+
+    def __write_messages(self):
+        while True:
+            message = self.__message_queue.get()
+            try:
+                if message is None:
+                    return
+                self.midi.send_message(message)
+            except Exception as e:
+                logger.exception("Error sending MIDI message: %s", e)
+                if self.__error is None:
+                    self.__error = e
+            finally:
+                self.__message_queue.task_done()
+
+    def __raise_error(self):
+        """Re-raise the first error the writer thread ran into."""
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Wait until all the queued messages are sent.
+
+        Raises:
+            Exception: The first error raised while sending the messages.
+        """
+        if self.__thread.is_alive():
+            self.__message_queue.join()
+        self.__raise_error()
+
+    def close(self):
+        """Send everything that's queued, stop the writer and close the port.
+
+        Raises:
+            Exception: The first error raised while sending the messages.
+        """
+        if not self.is_open:
+            return
+        atexit.unregister(self.close)
+        self.__message_queue.put_nowait(None)
+        self.__thread.join()
+        super().close()
+        self.__raise_error()
 
     def send(self, stat, dat1, dat2):
         """Send a single message."""
-        self.midi.send_message([stat, dat1, dat2])
+        self.__raise_error()
+        self.__message_queue.put_nowait((stat, dat1, dat2))
 
     def send_sysex(self, messages):
         """Send a single system-exclusive message, given by list messages.
 
         The start (0xF0) and end bytes (0xF7) are added automatically.
 
-        Message should be in a format::
+        Message should be a sequence of data bytes (``list``, ``tuple``,
+        ``bytes``...) in a format::
 
             [ <dat1>, <dat2>, ..., <datN> ]
 
         """
-        self.midi.send_message([0xF0] + messages + [0xF7])
+        self.__raise_error()
+        self.__message_queue.put_nowait(b"\xf0" + bytes(messages) + b"\xf7")
+
+    def send_raw(self, message: bytes):
+        """Send a complete MIDI message, e.g. already framed SysEx bytes."""
+        self.__raise_error()
+        self.__message_queue.put_nowait(message)
+
+
+# rtmidi class, device wrapper and "not found" error for every direction
+DEVICE_CLASSES = {
+    Direction.input: (rtmidi.MidiIn, InputDevice, errors.InputDeviceNotFound),
+    Direction.output: (
+        rtmidi.MidiOut,
+        OutputDevice,
+        errors.OutputDeviceNotFound,
+    ),
+}
 
 
 class Midi:
     Direction = Direction
 
+    # Cached port names per direction: ``(timestamp, port names)``
+    _ports: Dict[Direction, Tuple[float, Tuple[str, ...]]] = {}
+
+    @staticmethod
+    def _classes(direction: Direction) -> tuple:
+        try:
+            return DEVICE_CLASSES[direction]
+        except (KeyError, TypeError):
+            raise errors.LaunchpadError(
+                message=f"Invalid direction value: {direction}",
+                code=errors.ErrorCode.value_error,
+            ) from None
+
+    @staticmethod
+    def _list_ports(direction: Direction) -> Tuple[str, ...]:
+        """Get the port names, enumerating the devices at most once a second.
+
+        Args:
+            direction (Direction): Is it an input or output device.
+
+        Returns:
+            tuple: Port names.
+        """
+        midi_class = Midi._classes(direction)[0]
+        now = time.monotonic()
+        cached = Midi._ports.get(direction)
+        if cached is not None and now - cached[0] < PORTS_TTL:
+            return cached[1]
+        midi = midi_class()
+        try:
+            ports = tuple(midi.get_ports())
+        finally:
+            midi.delete()
+        Midi._ports[direction] = (now, ports)
+        return ports
+
     @staticmethod
     def search_for_device(name: Optional[str], direction: Direction) -> bool:
         """Search for a device by name and direction.
@@ -140,25 +283,10 @@ class Midi:
         Returns:
             bool: ``True`` if the device is found ``False`` otherwise.
         """
-        if direction == Direction.input:
-            midi = rtmidi.MidiIn()
-        elif direction == Direction.output:
-            midi = rtmidi.MidiOut()
-        else:
-            raise errors.LaunchpadError(
-                message=f"Invalid direction value: {direction}",
-                code=errors.ErrorCode.value_error,
-            )
-
-        for i, port in enumerate(midi.get_ports()):
-            if port.lower().find(name.lower()) != -1:
-                midi.delete()
-                del midi
-                return True
-
-        midi.delete()
-        del midi
-        return False
+        name = name.casefold()
+        return any(
+            name in port.casefold() for port in Midi._list_ports(direction)
+        )
 
     @staticmethod
     def open_device(
@@ -180,30 +308,28 @@ class Midi:
         if name is None:
             return None
 
-        if direction == Direction.input:
-            midi = rtmidi.MidiIn()
-            error_class = errors.InputDeviceNotFound
-            wrapper_class = InputDevice
-        elif direction == Direction.output:
-            midi = rtmidi.MidiOut()
-            error_class = errors.OutputDeviceNotFound
-            wrapper_class = OutputDevice
-        else:
-            raise errors.LaunchpadError(
-                message=f"Invalid direction value: {direction}",
-                code=errors.ErrorCode.value_error,
-            )
+        midi_class, wrapper_class, error_class = Midi._classes(direction)
+        midi = midi_class()
 
         # FIXME: Hack!
         name, no = name
+        needle = name.casefold()
         found = -1
-        for i, port in enumerate(midi.get_ports()):
-            if port.lower().find(name.lower()) != -1:
-                found += 1
-                if found == no:
-                    midi.open_port(i)
-                    return wrapper_class(midi)
+        try:
+            # Port indices are only valid for this client, so the ports are
+            # listed again instead of using the cached names.
+            for i, port in enumerate(midi.get_ports()):
+                if needle in port.casefold():
+                    found += 1
+                    if found == no:
+                        midi.open_port(i)
+                        # The port list may change once a port is in use
+                        Midi._ports.pop(direction, None)
+                        return wrapper_class(midi)
+        except BaseException:
+            # The client is only handed over to the wrapper on success
+            midi.delete()
+            raise
 
         midi.delete()
-        del midi
         raise error_class(name)
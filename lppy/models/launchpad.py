@@ -1,15 +1,22 @@
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 
 from lppy import errors
 from lppy.enums import Color, RGB
-from lppy.chartab import CHAR_TAB
-from lppy.base import LaunchpadBase
+from lppy.base import LaunchpadBase, char_pixels
+
+# Color code bytes for every red/green brightness pair (0..3), indexed by
+# ``(green << 2) | red``.
+COLOR_CODES = bytes(
+    red | (green << 4) for green in range(4) for red in range(4)
+)
 
 
 class Launchpad(LaunchpadBase):
     """For 2-color Launchpads with 8x8 matrix and 2x8 top/right rows."""
 
+    __slots__ = ()
+
     # LED AND BUTTON NUMBERS IN RAW MODE (DEC):
     #
     # +---+---+---+---+---+---+---+---+
@@ -73,7 +80,8 @@ class Launchpad(LaunchpadBase):
             turned off. In all other cases turned on, like the function name
             implies.
         """
-        if color == Color.black:
+        self._leds.clear()
+        if color is Color.black:
             # Send reset message
             self.output.send(176, 0, 0)
         else:
@@ -85,16 +93,11 @@ class Launchpad(LaunchpadBase):
 
         NOTE: In here, number is 0..7 (left..right).
         """
-        red = min(color.r, 3)  # make int and limit to <=3
-        red = max(red, 0)  # no negative numbers
-
-        green = min(int(color.g), 3)  # make int and limit to <=3
-        green = max(green, 0)  # no negative numbers
-
-        led = 0
-        led |= red
-        led |= green << 4
-        return led
+        red, green, _ = color
+        if not (0 <= red <= 3 and 0 <= green <= 3):
+            red = max(min(red, 3), 0)  # limit to 0..3
+            green = max(min(int(green), 3), 0)  # make int and limit to 0..3
+        return COLOR_CODES[(green << 2) | red]
 
     def led_on(
         self,
@@ -102,6 +105,7 @@ class Launchpad(LaunchpadBase):
         n: Optional[int] = None,
         x: Optional[int] = None,
         y: Optional[int] = None,
+        force: bool = False,
     ):
         """Turn on the selected LED using selected color.
 
@@ -111,36 +115,50 @@ class Launchpad(LaunchpadBase):
         """
         color = self._get_color(color)
         if n is not None:
-
-            if 199 < n < 208:
-                self.output.send(176, n - 200 + 104, color)
-            elif n < 0 or n > 120:
-                raise errors.LEDSelectionError(n=n, x=x, y=y)
-            else:
-                self.output.send(144, n, color)
+            self._send_led_number(n, color, force)
         elif x is not None and y is not None:
             if x < 0 or x > 8 or y < 0 or y > 8:
                 raise errors.LEDSelectionError(n=n, x=x, y=y)
 
             if y == 0:
-                self.output.send(176, x + 104, color)
+                self._send_led(176, x + 104, color, force)
             else:
-                self.output.send(144, ((y - 1) << 4) | x, color)
+                self._send_led(144, ((y - 1) << 4) | x, color, force)
         else:
             raise errors.LEDSelectionError(n=n, x=x, y=y)
 
+    def led_on_many(
+        self, leds: Iterable[Tuple[int, RGB]], force: bool = False
+    ):
+        """Turn on multiple LEDs, each with its own color."""
+        get_color = self._get_color
+        send_led_number = self._send_led_number
+        for n, color in leds:
+            send_led_number(n, get_color(color), force)
+
+    def _send_led_number(self, n: int, color: int, force: bool = False):
+        """Send the color code byte to the LED selected by its number."""
+        if 199 < n < 208:
+            self._send_led(176, n - 200 + 104, color, force)
+        elif n < 0 or n > 120:
+            raise errors.LEDSelectionError(n=n, x=None, y=None)
+        else:
+            self._send_led(144, n, color, force)
+
+    def _send_led(self, stat: int, number: int, color: int, force: bool):
+        """Send the color code byte unless the LED already has that color."""
+        # Top row LEDs are controllers and the rest notes, so key by both
+        key = (stat << 8) | number
+        if not force and self._leds.get(key) == color:
+            return
+        self._leds[key] = color
+        self.output.send(stat, number, color)
+
     def write_char(self, char: str, color: RGB, offset: int = 0):
         """Write character in colors and lateral offset."""
-        codes = CHAR_TAB[self._limit(ord(char), minimum=0, maximum=255)]
-        index = 0
-        black = RGB()
-
-        for i in range(0, 8 * 16, 16):
-            for j in range(8):
-                n = i + j + offset
-                if i <= n < i + 8:
-                    if codes[index] & 0x80 >> j:
-                        self.led_on(color, n=n)
-                    else:
-                        self.led_on(black, n=n)
-            index += 1
+        # Color code bytes indexed by the pixel value, resolved once per
+        # character. Grid LEDs are all notes.
+        codes = (COLOR_CODES[0], self._get_color(color))
+        send_led = self._send_led
+        for n, lit in char_pixels(min(ord(char), 255), offset, 0, 16):
+            send_led(144, n, codes[lit], False)
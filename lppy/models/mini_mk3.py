@@ -1,14 +1,40 @@
+import sys
 import enum
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Tuple, Union
 
 from lppy import errors
-from lppy.enums import Color, RGB
+from lppy.enums import Color
 from lppy.models.pro import LaunchpadPro
 
+# Header of the Launchpad Mini Mk3 SysEx messages and the command prefixes
+SYSEX_HEADER = bytes((0, 32, 41, 2, 13))
+SYSEX_SET_LAYOUT = SYSEX_HEADER + bytes((0,))
+SYSEX_SET_MODE = SYSEX_HEADER + bytes((14,))
+SYSEX_LED = SYSEX_HEADER + bytes((3,))
+
+# Setting all the LEDs with a single SysEx message was seen misbehaving on
+# Linux, so note on messages are sent there unless asked otherwise.
+LED_ALL_SYSEX = sys.platform != "linux"
+
+
+@lru_cache(maxsize=128)
+def _led_all_message(specs: bytes, value: int) -> bytes:
+    """Return the LED lighting message setting every spec to ``value``.
+
+    There are only 128 palette colors, so the messages are built once and
+    reused for every following ``led_all_on`` call.
+    """
+    message = bytearray(SYSEX_LED + specs)
+    message[len(SYSEX_LED) + 2 :: 3] = bytes((value,)) * (len(specs) // 3)
+    return bytes(message)
+
 
 class LaunchpadMiniMk3(LaunchpadPro):
     """For 3-color "Mk3" Launchpads; Mini and Pro."""
 
+    __slots__ = ()
+
     # LED AND BUTTON NUMBERS IN RAW MODE (DEC)
     #
     #
@@ -67,6 +93,22 @@ class LaunchpadMiniMk3(LaunchpadPro):
     INPUT_NAME = ("Launchpad Mini MK3", 1)
     OUTPUT_NAME = ("Launchpad Mini MK3", 1)
 
+    # Maximum number of LEDs that can be set with a single SysEx message
+    MAX_LEDS_PER_SYSEX = 81
+
+    # LED lighting SysEx, every LED is an RGB lighting spec (type 3)
+    LED_RGB_HEADER = SYSEX_LED
+    LED_RGB_SPEC = bytes((3,))
+    LED_RGB_PREFIX = b"\xf0" + LED_RGB_HEADER + LED_RGB_SPEC
+
+    # Raw numbers of all the LEDs in the 9x9 grid
+    GRID_LEDS = tuple(
+        (x + 1) + ((y + 1) * 10) for x in range(9) for y in range(9)
+    )
+    # Static color (lighting type 0) specs for the whole grid, every third
+    # byte is the palette color
+    GRID_LED_SPECS = bytes(b for n in GRID_LEDS for b in (0, n, 0))
+
     class Layout(enum.Enum):
         session = 0x00
         drums = 0x04
@@ -84,13 +126,10 @@ class LaunchpadMiniMk3(LaunchpadPro):
         self.set_mode(self.Mode.programmer_mode)
         self.set_layout(self.Layout.programmer)
 
-    def close(self):
-        """Close this Launchpad."""
+    def _restore(self):
         # We have to go back to custom modes before closing the connection,
         # otherwise Launchpad will stuck in programmer mode.
-        if self.output is not None and self.output.is_open:
-            self.set_layout(self.Layout.keys)
-        super().close()
+        self.set_layout(self.Layout.keys)
 
     def set_layout(self, layout: Layout = Layout.session):
         """Sets the button layout to the set, specified by the layout.
@@ -98,46 +137,93 @@ class LaunchpadMiniMk3(LaunchpadPro):
         Args:
             layout (Layout): Layout value.
         """
-        self.output.send_sysex([0, 32, 41, 2, 13, 0, layout.value])
+        self._send_batch()
+        self._leds.clear()
+        self.output.send_sysex(SYSEX_SET_LAYOUT + bytes((layout.value,)))
 
     def set_mode(self, mode: Mode = Mode.programmer_mode):
         """Selects the Mk3's mode."""
-        self.output.send_sysex([0, 32, 41, 2, 13, 14, mode.value])
+        self._send_batch()
+        self._leds.clear()
+        self.output.send_sysex(SYSEX_SET_MODE + bytes((mode.value,)))
 
-    def led_all_on(self, color: Color):
-        """Quickly sets all all LEDs to the same color."""
+    def led_all_on(self, color: Color, use_sysex: bool = LED_ALL_SYSEX):
+        """Quickly sets all all LEDs to the same color.
+
+        Args:
+            color (Color): Palette color for all the LEDs.
+            use_sysex (bool): Set all LEDs with a single LED lighting SysEx
+                message. If ``False`` a note on message is sent for every LED
+                instead. Defaults to ``False`` on Linux and ``True``
+                everywhere else.
+        """
+        self._send_batch()
+        self._leds.clear()
         # TODO: Maybe the SysEx was indeed a better idea :)
         #       Did some tests:
         #         MacOS:   Doesn't matter.
         #         Windows: SysEx much better.
         #         Linux:   Completely freaks out.
-        for x in range(9):
-            for y in range(9):
-                self.output.send(144, (x + 1) + ((y + 1) * 10), color.value)
+        if use_sysex:
+            self.output.send_sysex(
+                _led_all_message(self.GRID_LED_SPECS, color.value)
+            )
+        else:
+            value = color.value
+            send = self.output.send
+            for n in self.GRID_LEDS:
+                send(144, n, value)
+
+    def led_pulse(self, color: Color, n: Union[int, Iterable[int]]):
+        """Pulse the selected LEDs using a palette color.
 
-    def led_on(
+        Args:
+            color (Color): Palette color.
+            n (Union[int, Iterable[int]]): LED number or numbers. All the LEDs
+                are set with a single SysEx message.
+        """
+        self._send_lighting(lighting_type=2, n=n, colors=(color.value,))
+
+    def led_flash(
         self,
-        color: RGB,
-        n: Optional[int] = None,
-        x: Optional[int] = None,
-        y: Optional[int] = None,
+        color: Color,
+        n: Union[int, Iterable[int]],
+        other_color: Color = Color.black,
     ):
-        # Red green and blue can be only between 0-63
-        color = color.scale(minimum=0, maximum=63)
+        """Flash the selected LEDs between two palette colors.
 
-        if n is not None:
-            if n < 0 or n > 99:
-                raise errors.LEDSelectionError(n=n, x=x, y=y)
+        Args:
+            color (Color): Palette color.
+            n (Union[int, Iterable[int]]): LED number or numbers. All the LEDs
+                are set with a single SysEx message.
+            other_color (Color): Palette color to flash with.
+        """
+        self._send_lighting(
+            lighting_type=1, n=n, colors=(other_color.value, color.value)
+        )
 
-            self.output.send_sysex(
-                [0, 32, 41, 2, 13, 3, 3, n, color.r, color.g, color.b]
-            )
-        elif x is not None and y is not None:
-            if x < 0 or x > 9 or y < 0 or y > 9:
-                raise errors.LEDSelectionError(n=n, x=x, y=y)
-            led = 90 - (10 * y) + x
-            self.output.send_sysex(
-                [0, 32, 41, 2, 13, 3, 3, led, color.r, color.g, color.b]
-            )
-        else:
-            raise errors.LEDSelectionError(n=n, x=x, y=y)
+    def _send_lighting(
+        self,
+        lighting_type: int,
+        n: Union[int, Iterable[int]],
+        colors: Tuple[int, ...],
+    ):
+        """Send the same LED lighting spec for one or more LEDs."""
+        self._send_batch()
+        numbers = (n,) if isinstance(n, int) else n
+        state = self._leds
+        message = bytearray(SYSEX_LED)
+        count = 0
+        for number in numbers:
+            if not 0 <= number <= 99:
+                raise errors.LEDSelectionError(n=number, x=None, y=None)
+            # Animated LEDs don't have a single color to compare with
+            state.pop(number, None)
+            message.extend((lighting_type, number, *colors))
+            count += 1
+            if count == self.MAX_LEDS_PER_SYSEX:
+                self.output.send_sysex(message)
+                message = bytearray(SYSEX_LED)
+                count = 0
+        if count > 0:
+            self.output.send_sysex(message)
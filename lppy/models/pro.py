@@ -1,10 +1,34 @@
 import enum
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
 
 from lppy import errors
-from lppy.chartab import CHAR_TAB
 from lppy.enums import Color, RGB
-from lppy.models.launchpad import LaunchpadBase
+from lppy.base import LaunchpadBase, char_pixels
+
+# Header of the Launchpad Pro SysEx messages and the command prefixes
+SYSEX_HEADER = bytes((0, 32, 41, 2, 16))
+SYSEX_SET_LAYOUT = SYSEX_HEADER + bytes((34,))
+SYSEX_SET_MODE = SYSEX_HEADER + bytes((33,))
+SYSEX_LED_ALL = SYSEX_HEADER + bytes((14,))
+SYSEX_LED_RGB = SYSEX_HEADER + bytes((11,))
+
+# Color channel values (0..255) scaled to the 0..63 range used by the device
+CHANNEL_SCALE = bytes(
+    RGB(r=value).scale(minimum=0, maximum=63).r for value in range(256)
+)
+
+
+@lru_cache(maxsize=1024)
+def scale_color(color: RGB) -> bytes:
+    """Scale the color to the 0..63 range used by the device.
+
+    Channels outside of 0..255 are clamped first.
+
+    Returns:
+        bytes: Scaled red, green and blue channels.
+    """
+    return bytes(CHANNEL_SCALE[max(0, min(int(c), 255))] for c in color)
 
 
 class LaunchpadPro(LaunchpadBase):
@@ -13,6 +37,8 @@ class LaunchpadPro(LaunchpadBase):
     And 4x8 left/right/top/bottom rows
     """
 
+    __slots__ = ()
+
     # LED AND BUTTON NUMBERS IN RAW MODE (DEC)
     # WITH LAUNCHPAD IN "LIVE MODE" (PRESS SETUP, top-left GREEN).
     #
@@ -110,6 +136,16 @@ class LaunchpadPro(LaunchpadBase):
     INPUT_NAME = ("Pro", 0)
     OUTPUT_NAME = ("Pro", 0)
 
+    # Maximum number of LEDs that can be set with a single SysEx message
+    MAX_LEDS_PER_SYSEX = 78
+
+    # SysEx message setting RGB LEDs, and the bytes preceding the number of
+    # every LED in it
+    LED_RGB_HEADER = SYSEX_LED_RGB
+    LED_RGB_SPEC = b""
+    # Framed single RGB LED message up to the LED number
+    LED_RGB_PREFIX = b"\xf0" + LED_RGB_HEADER + LED_RGB_SPEC
+
     class Layout(enum.Enum):
         session = 0x00
         drum_rack = 0x01
@@ -133,15 +169,36 @@ class LaunchpadPro(LaunchpadBase):
         Args:
             layout (Layout): Layout value.
         """
-        self.output.send_sysex([0, 32, 41, 2, 16, 34, layout.value])
+        self._send_batch()
+        self._leds.clear()
+        self.output.send_sysex(SYSEX_SET_LAYOUT + bytes((layout.value,)))
 
     def set_mode(self, mode: Mode = Mode.ableton_live_mode):
         """Selects the Pro's mode."""
-        self.output.send_sysex([0, 32, 41, 2, 16, 33, mode.value])
+        self._send_batch()
+        self._leds.clear()
+        self.output.send_sysex(SYSEX_SET_MODE + bytes((mode.value,)))
 
     def led_all_on(self, color: Color):
         """Quickly sets all all LEDs to the same color."""
-        self.output.send_sysex([0, 32, 41, 2, 16, 14, color.value])
+        self._send_batch()
+        self._leds.clear()
+        self.output.send_sysex(SYSEX_LED_ALL + bytes((color.value,)))
+
+    @staticmethod
+    def _led_number(
+        n: Optional[int] = None,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+    ) -> int:
+        """Validate the LED selection and return the LED number."""
+        if n is not None:
+            if 0 <= n <= 99:
+                return n
+        elif x is not None and y is not None:
+            if 0 <= x <= 9 and 0 <= y <= 9:
+                return 90 - (10 * y) + x
+        raise errors.LEDSelectionError(n=n, x=x, y=y)
 
     def led_on(
         self,
@@ -149,40 +206,61 @@ class LaunchpadPro(LaunchpadBase):
         n: Optional[int] = None,
         x: Optional[int] = None,
         y: Optional[int] = None,
+        force: bool = False,
     ):
+        n = self._led_number(n=n, x=x, y=y)
+        if force:
+            self._leds.pop(n, None)
+        if self._batch is not None:
+            self._batch.append((n, color))
+            return
+        if self._leds.get(n) == color:
+            return
+        self._leds[n] = color
 
         # Red green and blue can be only between 0-63
-        color = color.scale(minimum=0, maximum=63)
+        self.output.send_raw(
+            self.LED_RGB_PREFIX + bytes((n,)) + scale_color(color) + b"\xf7"
+        )
 
-        if n is not None:
-            if n < 0 or n > 99:
-                raise errors.LEDSelectionError(n=n, x=x, y=y)
+    def led_on_many(
+        self, leds: Iterable[Tuple[int, RGB]], force: bool = False
+    ):
+        """Turn on multiple LEDs with a single SysEx message."""
+        state = self._leds
+        if self._batch is not None:
+            if force:
+                leds = list(leds)
+                for n, _ in leds:
+                    state.pop(n, None)
+            self._batch.extend(leds)
+            return
 
-            self.output.send_sysex(
-                [0, 32, 41, 2, 16, 11, n, color.r, color.g, color.b]
-            )
-        elif x is not None and y is not None:
-            if x < 0 or x > 9 or y < 0 or y > 9:
-                raise errors.LEDSelectionError(n=n, x=x, y=y)
-            led = 90 - (10 * y) + x
-            self.output.send_sysex(
-                [0, 32, 41, 2, 16, 11, led, color.r, color.g, color.b]
-            )
-        else:
-            raise errors.LEDSelectionError(n=n, x=x, y=y)
+        header, spec = self.LED_RGB_HEADER, self.LED_RGB_SPEC
+        message = bytearray(header)
+        count = 0
+        for n, color in leds:
+            if not 0 <= n <= 99:
+                raise errors.LEDSelectionError(n=n, x=None, y=None)
+            if not force and state.get(n) == color:
+                continue
+            state[n] = color
+            message += spec
+            message.append(n)
+            message += scale_color(color)
+            count += 1
+            if count == self.MAX_LEDS_PER_SYSEX:
+                self.output.send_sysex(message)
+                message = bytearray(header)
+                count = 0
+        if count > 0:
+            self.output.send_sysex(message)
 
     def write_char(self, char: str, color: RGB, offset: int = 0):
         """Write character in colors and lateral offset."""
-        codes = CHAR_TAB[self._limit(ord(char), minimum=0, maximum=255)]
-        index = 0
-        black = RGB()
-
-        for i in range(81, 1, -10):
-            for j in range(8):
-                n = i + j + offset
-                if i <= n < i + 8:
-                    if codes[index] & 0x80 >> j:
-                        self.led_on(color, n=n)
-                    else:
-                        self.led_on(black, n=n)
-            index += 1
+        # Indexed by the pixel value
+        colors = (RGB(), color)
+        self.led_on_many(
+            (n, colors[lit])
+            for n, lit in char_pixels(min(ord(char), 255), offset, 81, -10)
+        )
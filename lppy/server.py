@@ -1,4 +1,5 @@
-import time
+import signal
+import threading
 
 from lppy.layout import Layout
 
@@ -6,10 +7,32 @@ from lppy.layout import Layout
 class Server:
     def __init__(self, layout: Layout):
         self.layout = layout
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Stop the server."""
+        self._stop.set()
 
     def run(self):
-        while True:
-            try:
-                time.sleep(100)
-            except KeyboardInterrupt:
-                return
+        """Block until the server is stopped or interrupted with Ctrl-C.
+
+        MIDI callbacks are handled on their own threads, so the calling
+        thread just waits on an event. It wakes up periodically because an
+        untimed wait can't be interrupted with Ctrl-C on Windows.
+
+        On the main thread SIGINT stops the server and the previous handler
+        is restored afterwards. Signal handlers can only be installed from
+        the main thread, so on other threads ``stop`` has to be used.
+        """
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        if on_main_thread:
+            previous = signal.signal(signal.SIGINT, lambda *_: self.stop())
+        try:
+            while not self._stop.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if on_main_thread:
+                signal.signal(signal.SIGINT, previous)
+            self.layout.launchpad.close()
@@ -0,0 +1,90 @@
+import pytest
+
+from lppy.enums import Color, RGB
+from lppy.models import LaunchpadMiniMk3, LaunchpadPro
+from lppy.tests.utils import create_launchpad
+
+MODELS = (LaunchpadPro, LaunchpadMiniMk3)
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_led_on_skips_unchanged_color(cls):
+    launchpad = create_launchpad(cls)
+    launchpad.led_on(RGB(r=255), n=11)
+    launchpad.led_on(RGB(r=255), n=11)
+    assert len(launchpad.output.messages) == 1
+    launchpad.led_on(RGB(g=255), n=11)
+    assert len(launchpad.output.messages) == 2
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_led_on_force_resends(cls):
+    launchpad = create_launchpad(cls)
+    launchpad.led_on(RGB(r=255), n=11)
+    launchpad.led_on(RGB(r=255), n=11, force=True)
+    messages = launchpad.output.messages
+    assert len(messages) == 2
+    assert messages[0] == messages[1]
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_led_on_many_skips_unchanged_colors(cls):
+    launchpad = create_launchpad(cls)
+    launchpad.led_on(RGB(r=255), n=11)
+    launchpad.led_on_many([(11, RGB(r=255)), (12, RGB(r=255))])
+    single = cls.LED_RGB_HEADER + cls.LED_RGB_SPEC + bytes((12, 63, 0, 0))
+    assert launchpad.output.messages[1] == b"\xf0" + single + b"\xf7"
+    launchpad.led_on_many([(11, RGB(r=255)), (12, RGB(r=255))])
+    assert len(launchpad.output.messages) == 2
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_led_on_many_force_resends(cls):
+    launchpad = create_launchpad(cls)
+    leds = [(11, RGB(r=255)), (12, RGB(b=255))]
+    launchpad.led_on_many(leds)
+    launchpad.led_on_many(leds, force=True)
+    messages = launchpad.output.messages
+    assert len(messages) == 2
+    assert messages[0] == messages[1]
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_batch_sends_changed_leds_once(cls):
+    launchpad = create_launchpad(cls)
+    launchpad.led_on(RGB(r=255), n=11)
+    with launchpad.batch():
+        launchpad.led_on(RGB(r=255), n=11)
+        launchpad.led_on(RGB(g=255), n=12)
+        launchpad.led_on(RGB(b=255), n=13)
+    messages = launchpad.output.messages
+    assert len(messages) == 2
+    assert messages[1] == (
+        b"\xf0"
+        + cls.LED_RGB_HEADER
+        + cls.LED_RGB_SPEC
+        + bytes((12, 0, 63, 0))
+        + cls.LED_RGB_SPEC
+        + bytes((13, 0, 0, 63))
+        + b"\xf7"
+    )
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_led_all_on_forgets_colors(cls):
+    launchpad = create_launchpad(cls)
+    launchpad.led_on(RGB(r=255), n=11)
+    launchpad.led_all_on(Color.black)
+    count = len(launchpad.output.messages)
+    launchpad.led_on(RGB(r=255), n=11)
+    assert len(launchpad.output.messages) == count + 1
+
+
+@pytest.mark.parametrize("cls", MODELS)
+def test_set_layout_forgets_colors(cls):
+    launchpad = create_launchpad(cls)
+    launchpad.led_on(RGB(r=255), n=11)
+    launchpad.set_layout(cls.Layout.session)
+    count = len(launchpad.output.messages)
+    launchpad.led_on(RGB(r=255), n=11)
+    assert len(launchpad.output.messages) == count + 1
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from lppy.midi import InputDevice, OutputDevice
+from lppy.message import Action, Message
+
+
+class Midi:
+    """rtmidi port double recording the sent messages."""
+
+    def __init__(self):
+        self.messages = []
+        self.callback = None
+        self.deleted = False
+        self.error = None
+
+    def send_message(self, message):
+        if self.error is not None:
+            raise self.error
+        self.messages.append(bytes(message))
+
+    def set_callback(self, callback, data=None):
+        self.callback = callback
+
+    def delete(self):
+        self.deleted = True
+
+
+def test_output_close_sends_queued_messages():
+    midi = Midi()
+    output = OutputDevice(midi)
+    for n in range(100):
+        output.send(144, n, 1)
+    output.send_sysex([1, 2, 3])
+    output.close()
+    assert len(midi.messages) == 101
+    assert midi.messages[-1] == b"\xf0\x01\x02\x03\xf7"
+    assert midi.deleted
+    assert not output.is_open
+
+
+def test_output_close_is_idempotent():
+    output = OutputDevice(Midi())
+    output.close()
+    output.close()
+    # Nothing is consuming the queue any more, flush mustn't block
+    output.flush()
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda output: output.send(144, 2, 1),
+        lambda output: output.send_sysex([1]),
+        lambda output: output.send_raw(b"\xf0\x01\xf7"),
+        lambda output: output.flush(),
+        lambda output: output.close(),
+    ],
+    ids=["send", "send_sysex", "send_raw", "flush", "close"],
+)
+def test_output_reraises_send_error(call):
+    midi = Midi()
+    midi.error = RuntimeError("device gone")
+    output = OutputDevice(midi)
+    output.send(144, 1, 1)
+    output.send(144, 1, 1)
+    # Wait for the writer thread without consuming the error
+    output._OutputDevice__message_queue.join()
+    with pytest.raises(RuntimeError, match="device gone"):
+        call(output)
+    # Only the first error is kept, and it's raised once
+    midi.error = None
+    output.flush()
+    output.close()
+    assert midi.deleted
+
+
+def test_input_close_stops_dispatch_thread():
+    midi = Midi()
+    input = InputDevice(midi)
+    thread = input._InputDevice__thread
+    received = []
+    done = threading.Event()
+
+    def callback(message):
+        received.append(message)
+        done.set()
+
+    input.set_callback(Action.press, callback)
+    midi.callback(([144, 11, 127], 0.0))
+    assert done.wait(1)
+    assert received == [Message(Action.press, 144, 11, 127, 0.0)]
+
+    input.close()
+    assert not thread.is_alive()
+    assert midi.deleted
@@ -0,0 +1,33 @@
+from lppy.enums import RGB
+from lppy.models.pro import LaunchpadPro, scale_color
+from lppy.tests.utils import create_launchpad
+
+
+def test_scale_color():
+    assert scale_color(RGB(0, 128, 255)) == bytes((0, 31, 63))
+
+
+def test_scale_color_clamps_negative_channels():
+    assert scale_color(RGB(-1, -128, -255)) == bytes((0, 0, 0))
+
+
+def test_scale_color_clamps_channels_above_255():
+    assert scale_color(RGB(256, 1000, 255)) == bytes((63, 63, 63))
+
+
+def test_led_on_clamps_channels():
+    launchpad = create_launchpad(LaunchpadPro)
+    launchpad.led_on(RGB(-10, 300, 255), n=11)
+    assert launchpad.output.messages == [
+        LaunchpadPro.LED_RGB_PREFIX + bytes((11, 0, 63, 63)) + b"\xf7"
+    ]
+
+
+def test_led_on_many_clamps_channels():
+    launchpad = create_launchpad(LaunchpadPro)
+    launchpad.led_on_many([(11, RGB(-1, 0, 0)), (12, RGB(0, 0, 256))])
+    assert launchpad.output.messages == [
+        b"\xf0"
+        + bytes((0, 32, 41, 2, 16, 11, 11, 0, 0, 0, 12, 0, 0, 63))
+        + b"\xf7"
+    ]
@@ -0,0 +1,169 @@
+"""Scrolling and glyph rendering against the original formulas.
+
+``scroll_frames`` and ``char_pixels`` replace arithmetic that used to run for
+every frame and every pixel. The ``old_*`` functions below are that original
+code, so the cached tables can be checked against it.
+"""
+from typing import Dict, List, Tuple
+from unittest import mock
+
+import pytest
+
+from lppy.base import char_pixels, scroll_frames
+from lppy.chartab import CHAR_TAB
+from lppy.enums import RGB, Scroll
+from lppy.models import Launchpad, LaunchpadMiniMk3, LaunchpadPro
+from lppy.models.launchpad import COLOR_CODES
+from lppy.models.pro import scale_color
+from lppy.tests.utils import create_launchpad
+
+# Top-left LED number and the difference between rows of the 8x8 grid
+GRIDS = {Launchpad: (0, 16), LaunchpadPro: (81, -10)}
+GRIDS[LaunchpadMiniMk3] = GRIDS[LaunchpadPro]
+
+MODELS = (Launchpad, LaunchpadPro, LaunchpadMiniMk3)
+SCROLLS = (Scroll.left, Scroll.right, Scroll.none)
+STRINGS = ("", "A", "Hi", "lppy!", "Hello World")
+COLOR = RGB(r=255, g=128)
+
+
+def limit(n: int, minimum: int, maximum: int) -> int:
+    return max(min(maximum, n), minimum)
+
+
+def old_frames(string: str, scroll: Scroll) -> List[List[Tuple[str, int]]]:
+    """``write_char`` calls of every frame of the original ``write_string``."""
+    frames = []
+    if scroll == Scroll.left or scroll == Scroll.right:
+        if scroll == Scroll.left:
+            string += " "
+            steps = range((len(string) + 1) * 8)
+        else:
+            string = " " + string + " "
+            steps = range((len(string) + 1) * 8 - 7, 0, -1)
+        last = len(string) - 1
+        for n in steps:
+            frame = []
+            if n <= len(string) * 8:
+                index = limit((n // 16) * 2, 0, last)
+                frame.append((string[index], 8 - n % 16))
+            if n > 7:
+                index = limit((((n - 8) // 16) * 2) + 1, 0, last)
+                frame.append((string[index], 8 - (n - 8) % 16))
+            frames.append(frame)
+    else:
+        for char in string:
+            for _ in range(4):
+                frames.append([(char, 0)])
+    return frames
+
+
+def old_char_pixels(
+    char: str, offset: int, first: int, step: int
+) -> List[Tuple[int, bool]]:
+    """Pixels drawn by the original ``write_char``."""
+    codes = CHAR_TAB[limit(ord(char), 0, 255)]
+    pixels = []
+    for index, i in enumerate(range(first, first + 8 * step, step)):
+        for j in range(8):
+            n = i + j + offset
+            if i <= n < i + 8:
+                pixels.append((n, bool(codes[index] & 0x80 >> j)))
+    return pixels
+
+
+@pytest.mark.parametrize("scroll", (Scroll.left, Scroll.right))
+@pytest.mark.parametrize("length", range(1, 14))
+def test_scroll_frames(length, scroll):
+    string = "".join(chr(ord("a") + i) for i in range(length))
+    padded = string + " " if scroll == Scroll.left else f" {string} "
+    frames = [
+        [(padded[index], offset) for index, offset in frame]
+        for frame in scroll_frames(len(padded), scroll)
+    ]
+    assert frames == old_frames(string, scroll)
+
+
+@pytest.mark.parametrize("first, step", sorted(set(GRIDS.values())))
+def test_char_pixels(first, step):
+    for code in range(256):
+        for offset in range(-9, 10):
+            pixels = char_pixels(code, offset, first, step)
+            assert list(pixels) == old_char_pixels(
+                chr(code), offset, first, step
+            )
+
+
+@pytest.mark.parametrize("scroll", SCROLLS)
+@pytest.mark.parametrize("cls", MODELS)
+def test_write_string_frames(cls, scroll):
+    launchpad = create_launchpad(cls)
+    frames = [[]]
+
+    def write_char(self, char, color, offset=0):
+        frames[-1].append((char, offset))
+
+    def sleep_until(deadline, stop=None):
+        frames.append([])
+        return False
+
+    with mock.patch.object(cls, "write_char", write_char), mock.patch.object(
+        cls, "_sleep_until", staticmethod(sleep_until)
+    ):
+        for string in STRINGS:
+            frames[:] = [[]]
+            launchpad.write_string(string, COLOR, scroll, wait_ms=0)
+            assert frames[:-1] == old_frames(string, scroll)
+
+
+def device_state(cls, messages: List[bytes], state: Dict[int, bytes]):
+    """Apply the LED messages sent by the model to the LED state."""
+    if cls is Launchpad:
+        for message in messages:
+            if message[0] == 144:
+                state[message[1]] = message[2:]
+        return
+    header = b"\xf0" + cls.LED_RGB_HEADER
+    size = len(cls.LED_RGB_SPEC) + 4
+    for message in messages:
+        if message.startswith(header):
+            data = message[len(header) : -1]
+            for i in range(0, len(data), size):
+                led = data[i + len(cls.LED_RGB_SPEC) : i + size]
+                state[led[0]] = led[1:]
+
+
+@pytest.mark.parametrize("scroll", SCROLLS)
+@pytest.mark.parametrize("cls", MODELS)
+def test_write_string_led_state(cls, scroll):
+    if cls is Launchpad:
+        colors = (
+            bytes((COLOR_CODES[0],)),
+            bytes((Launchpad._get_color(COLOR),)),
+        )
+    else:
+        colors = (scale_color(RGB()), scale_color(COLOR))
+    first, step = GRIDS[cls]
+    launchpad = create_launchpad(cls)
+    messages = launchpad.output.messages
+    actual: List[Dict[int, bytes]] = []
+    state: Dict[int, bytes] = {}
+
+    def sleep_until(deadline, stop=None):
+        device_state(cls, messages, state)
+        messages.clear()
+        actual.append(dict(state))
+        return False
+
+    expected = []
+    expected_state: Dict[int, bytes] = {}
+    string = "Hi!"
+    for frame in old_frames(string, scroll):
+        for char, offset in frame:
+            for n, lit in old_char_pixels(char, offset, first, step):
+                expected_state[n] = colors[lit]
+        expected.append(dict(expected_state))
+
+    with mock.patch.object(cls, "_sleep_until", staticmethod(sleep_until)):
+        launchpad.write_string(string, COLOR, scroll, wait_ms=0)
+    assert actual == expected
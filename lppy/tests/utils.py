@@ -0,0 +1,42 @@
+from typing import Type, TypeVar
+from unittest import mock
+
+from lppy.base import LaunchpadBase
+from lppy.enums import Direction
+
+T = TypeVar("T", bound=LaunchpadBase)
+
+
+class Output:
+    """Output device that records the messages instead of sending them."""
+
+    def __init__(self):
+        self.messages = []
+
+    @property
+    def is_open(self):
+        return True
+
+    def send(self, stat, dat1, dat2):
+        self.messages.append(bytes((stat, dat1, dat2)))
+
+    def send_sysex(self, message):
+        self.messages.append(b"\xf0" + bytes(message) + b"\xf7")
+
+    def send_raw(self, message):
+        self.messages.append(bytes(message))
+
+
+def create_launchpad(cls: Type[T]) -> T:
+    """Create a Launchpad recording the messages it sends.
+
+    The messages sent while opening the Launchpad are discarded.
+    """
+
+    def open_device(name, direction):
+        return Output() if direction is Direction.output else None
+
+    with mock.patch("lppy.base.Midi.open_device", open_device):
+        launchpad = cls()
+    launchpad.output.messages.clear()
+    return launchpad
@@ -1,5 +1,3 @@
-import io
-import importlib.util
 from pathlib import Path
 from setuptools import setup, find_packages
 
@@ -7,13 +5,18 @@ author = "Viktor Kerkez"
 author_email = "alefnula@gmail.com"
 
 
+here = Path(__file__).parent
+
+
 def get_version():
-    """Import the version module and get the project version from it."""
-    version_py = Path(__file__).parent / "lppy" / "version.py"
-    spec = importlib.util.spec_from_file_location("version", version_py)
-    version = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(version)
-    return version.__version__
+    """Execute the version module and get the project version from it.
+
+    The version is computed from a ``Version`` instance, so the module can't
+    simply be parsed.
+    """
+    namespace = {}
+    exec((here / "lppy" / "version.py").read_text(encoding="utf-8"), namespace)
+    return namespace["__version__"]
 
 
 setup(
@@ -24,13 +27,15 @@ setup(
     maintainer=author,
     maintainer_email=author_email,
     description="Python library for controlling Novation Launchpads.",
-    long_description=io.open("README.md", "r", encoding="utf-8").read(),
+    long_description=(here / "README.md").read_text(encoding="utf-8"),
     long_description_content_type="text/markdown",
     url="https://github.com/alefnula/lppy",
     platforms=["Windows", "POSIX", "MacOSX"],
     license="Apache-2.0",
     packages=find_packages(),
-    install_requires=io.open("requirements.txt").read().splitlines(),
+    install_requires=(here / "requirements.txt")
+    .read_text(encoding="utf-8")
+    .splitlines(),
     entry_points="""
         [console_scripts]
         lppy=lppy.__main__:cli